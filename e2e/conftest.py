@@ -58,6 +58,12 @@ def test_api_url() -> str:
         host="127.0.0.1",
         port=port,
         log_level="warning",
+        loop="auto",
+        http="auto",
+        access_log=False,
+        proxy_headers=False,
+        server_header=False,
+        date_header=False,
     )
     server = uvicorn.Server(config)
     thread = threading.Thread(target=server.run, daemon=True)
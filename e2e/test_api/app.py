@@ -1,7 +1,11 @@
+import itertools
+import json
 import os
-from typing import Any
+import threading
+from pathlib import Path
+from typing import Any, Iterator
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Response
 from fastapi.openapi.utils import get_openapi
 
 from test_api.auth import require_auth
@@ -12,14 +16,26 @@ app = FastAPI(
     title="Test API",
     version="1.0.0",
     description="E2E test API for toolscript",
+    # /openapi.json is served by openapi_json() below.
+    openapi_url=None,
 )
 
 
+def _is_null_schema(obj: Any) -> bool:
+    """Return True for a bare `{"type": "null"}` schema."""
+    return isinstance(obj, dict) and len(obj) == 1 and obj.get("type") == "null"
+
+
 def _downgrade_schema(obj: Any) -> Any:
-    """Recursively convert OpenAPI 3.1 nullable patterns to 3.0.3 style."""
+    """Recursively convert OpenAPI 3.1 nullable patterns to 3.0.3 style.
+
+    Containers are rewritten in place and returned.
+    """
+    if not isinstance(obj, (dict, list)):
+        return obj
     if isinstance(obj, dict):
         if "anyOf" in obj:
-            non_null = [s for s in obj["anyOf"] if s != {"type": "null"}]
+            non_null = [s for s in obj["anyOf"] if not _is_null_schema(s)]
             if len(non_null) < len(obj["anyOf"]):
                 if len(non_null) == 1:
                     del obj["anyOf"]
@@ -31,14 +47,18 @@ def _downgrade_schema(obj: Any) -> Any:
         for k, v in obj.items():
             obj[k] = _downgrade_schema(v)
         return obj
-    if isinstance(obj, list):
-        return [_downgrade_schema(item) for item in obj]
+    for i, item in enumerate(obj):
+        obj[i] = _downgrade_schema(item)
     return obj
 
 
-def custom_openapi() -> dict[str, Any]:
-    if app.openapi_schema:
-        return app.openapi_schema
+# Pre-generated output of build_openapi(), refreshed with
+# `python -m test_api.dump_openapi` whenever routes or models change.
+OPENAPI_CACHE = Path(__file__).with_name("openapi_3_0_3.json")
+
+
+def build_openapi() -> dict[str, Any]:
+    """Generate the 3.0.3 schema from the app routes (without servers)."""
     schema = get_openapi(
         title=app.title,
         version=app.version,
@@ -46,7 +66,25 @@ def custom_openapi() -> dict[str, Any]:
         routes=app.routes,
     )
     schema["openapi"] = "3.0.3"
-    schema = _downgrade_schema(schema)
+    return _downgrade_schema(schema)
+
+
+def _load_openapi() -> dict[str, Any]:
+    """Load the pre-generated schema, rebuilding it if missing or stale."""
+    try:
+        schema = json.loads(OPENAPI_CACHE.read_text())
+    except FileNotFoundError:
+        return build_openapi()
+    info = schema.get("info", {})
+    if info.get("title") != app.title or info.get("version") != app.version:
+        return build_openapi()
+    return schema
+
+
+def custom_openapi() -> dict[str, Any]:
+    if app.openapi_schema:
+        return app.openapi_schema
+    schema = _load_openapi()
     # Inject the server URL so toolscript knows the base URL for API calls.
     # Set TEST_API_SERVER_URL env var before the first /openapi.json request.
     server_url = os.environ.get("TEST_API_SERVER_URL")
@@ -58,19 +96,120 @@ def custom_openapi() -> dict[str, Any]:
 
 app.openapi = custom_openapi  # type: ignore[method-assign]
 
+# Serialized form of app.openapi(), built on the first /openapi.json request.
+_openapi_json: bytes | None = None
+
+
+@app.get("/openapi.json", include_in_schema=False)
+def openapi_json() -> Response:
+    global _openapi_json
+    if _openapi_json is None:
+        _openapi_json = json.dumps(app.openapi(), separators=(",", ":")).encode()
+    return Response(_openapi_json, media_type="application/json")
+
+
+# Fixed JSON bodies for the admin/delete endpoints, serialized once.
+STATUS_OK = b'{"status":"ok"}'
+STATUS_DELETED = b'{"status":"deleted"}'
+
 # In-memory state
 db_pets: dict[int, Pet] = seed_pets()
 db_owners: dict[int, Owner] = seed_owners()
-next_pet_id: int = 5
+pet_ids: Iterator[int] = itertools.count(5)
+
+
+def _index_by_owner(pets: dict[int, Pet]) -> dict[int | None, dict[int, Pet]]:
+    index: dict[int | None, dict[int, Pet]] = {}
+    for pet in pets.values():
+        index.setdefault(pet.owner_id, {})[pet.id] = pet
+    return index
+
+
+def _index_by_status(pets: dict[int, Pet]) -> dict[PetStatus | None, dict[int, Pet]]:
+    # PetUpdate accepts an explicit null status, so None gets a bucket too.
+    index: dict[PetStatus | None, dict[int, Pet]] = {s: {} for s in PetStatus}
+    for pet in pets.values():
+        index.setdefault(pet.status, {})[pet.id] = pet
+    return index
+
+
+# Secondary indexes over db_pets: owner_id / status -> {pet_id: pet}.
+db_pets_by_owner: dict[int | None, dict[int, Pet]] = _index_by_owner(db_pets)
+db_pets_by_status: dict[PetStatus | None, dict[int, Pet]] = _index_by_status(db_pets)
+
+# Materialized db_pets.values() for list_pets, cleared on every mutation.
+_pets_cache: list[Pet] | None = None
+
+# Sync handlers run concurrently in FastAPI's threadpool. Mutations and the
+# cache fill share this lock so a reader can never store a pre-mutation list
+# after the mutation has cleared the cache.
+_state_lock = threading.Lock()
+
 
+def _all_pets() -> list[Pet]:
+    global _pets_cache
+    cached = _pets_cache
+    if cached is not None:
+        return cached
+    with _state_lock:
+        if _pets_cache is None:
+            _pets_cache = list(db_pets.values())
+        return _pets_cache
 
-@app.post("/reset", tags=["admin"], operation_id="reset_data")
-def reset_data() -> dict[str, str]:
-    global db_pets, db_owners, next_pet_id
-    db_pets = seed_pets()
-    db_owners = seed_owners()
-    next_pet_id = 5
-    return {"status": "ok"}
+
+def _insert_in_order(bucket: dict[int, Pet], pet: Pet) -> None:
+    """Add a pet to an index bucket, keeping the bucket in db_pets order.
+
+    db_pets only ever grows by appending fresh ids, so its order is id
+    order; a pet moving into a bucket that already holds later ids is
+    re-sorted into place.
+    """
+    out_of_order = pet.id not in bucket and bool(bucket) and next(reversed(bucket)) > pet.id
+    bucket[pet.id] = pet
+    if out_of_order:
+        ordered = sorted(bucket.items())
+        bucket.clear()
+        bucket.update(ordered)
+
+
+def _store_pet(pet: Pet) -> None:
+    """Insert or replace a pet, keeping the indexes in sync."""
+    global _pets_cache
+    with _state_lock:
+        pets, by_owner, by_status = db_pets, db_pets_by_owner, db_pets_by_status
+        previous = pets.get(pet.id)
+        if previous is not None and previous.owner_id != pet.owner_id:
+            del by_owner[previous.owner_id][pet.id]
+        if previous is not None and previous.status is not pet.status:
+            del by_status[previous.status][pet.id]
+        pets[pet.id] = pet
+        _insert_in_order(by_owner.setdefault(pet.owner_id, {}), pet)
+        _insert_in_order(by_status.setdefault(pet.status, {}), pet)
+        _pets_cache = None
+
+
+def _remove_pet(pet_id: int) -> None:
+    """Delete a pet, keeping the indexes in sync."""
+    global _pets_cache
+    with _state_lock:
+        pet = db_pets.pop(pet_id)
+        del db_pets_by_owner[pet.owner_id][pet_id]
+        del db_pets_by_status[pet.status][pet_id]
+        _pets_cache = None
+
+
+@app.post("/reset", tags=["admin"], response_model=dict[str, str], operation_id="reset_data")
+def reset_data() -> Response:
+    global db_pets, db_owners, db_pets_by_owner, db_pets_by_status, pet_ids, _pets_cache
+    pets = seed_pets()
+    with _state_lock:
+        db_pets = pets
+        db_owners = seed_owners()
+        db_pets_by_owner = _index_by_owner(pets)
+        db_pets_by_status = _index_by_status(pets)
+        pet_ids = itertools.count(5)
+        _pets_cache = None
+    return Response(STATUS_OK, media_type="application/json")
 
 
 @app.get("/pets", tags=["pets"], operation_id="list_pets")
@@ -78,9 +217,10 @@ def list_pets(
     limit: int | None = None,
     status: PetStatus | None = None,
 ) -> PetList:
-    pets = list(db_pets.values())
-    if status is not None:
-        pets = [p for p in pets if p.status == status]
+    if status is None:
+        pets = _all_pets()
+    else:
+        pets = list(db_pets_by_status[status].values())
     total = len(pets)
     if limit is not None:
         pets = pets[:limit]
@@ -89,36 +229,37 @@ def list_pets(
 
 @app.post("/pets", tags=["pets"], status_code=201, dependencies=[Depends(require_auth)], operation_id="create_pet")
 def create_pet(body: PetCreate) -> Pet:
-    global next_pet_id
-    pet = Pet(id=next_pet_id, **body.model_dump())
-    db_pets[next_pet_id] = pet
-    next_pet_id += 1
+    # body is already validated; skip re-validating the same fields.
+    pet = Pet.model_construct(id=next(pet_ids), **body.__dict__)
+    _store_pet(pet)
     return pet
 
 
 @app.get("/pets/{pet_id}", tags=["pets"], operation_id="get_pet")
 def get_pet(pet_id: int) -> Pet:
-    if pet_id not in db_pets:
+    pets = db_pets
+    if pet_id not in pets:
         raise HTTPException(status_code=404, detail="Pet not found")
-    return db_pets[pet_id]
+    return pets[pet_id]
 
 
 @app.put("/pets/{pet_id}", tags=["pets"], dependencies=[Depends(require_auth)], operation_id="update_pet")
 def update_pet(pet_id: int, body: PetUpdate) -> Pet:
-    if pet_id not in db_pets:
+    pets = db_pets
+    if pet_id not in pets:
         raise HTTPException(status_code=404, detail="Pet not found")
-    existing = db_pets[pet_id]
-    updated = existing.model_copy(update=body.model_dump(exclude_unset=True))
-    db_pets[pet_id] = updated
+    existing = pets[pet_id]
+    updated = existing.model_copy(update={k: getattr(body, k) for k in body.model_fields_set})
+    _store_pet(updated)
     return updated
 
 
-@app.delete("/pets/{pet_id}", tags=["pets"], dependencies=[Depends(require_auth)], operation_id="delete_pet")
-def delete_pet(pet_id: int) -> dict[str, str]:
+@app.delete("/pets/{pet_id}", tags=["pets"], dependencies=[Depends(require_auth)], response_model=dict[str, str], operation_id="delete_pet")
+def delete_pet(pet_id: int) -> Response:
     if pet_id not in db_pets:
         raise HTTPException(status_code=404, detail="Pet not found")
-    del db_pets[pet_id]
-    return {"status": "deleted"}
+    _remove_pet(pet_id)
+    return Response(STATUS_DELETED, media_type="application/json")
 
 
 @app.get("/owners", tags=["owners"], operation_id="list_owners")
@@ -130,4 +271,4 @@ def list_owners() -> list[Owner]:
 def list_owner_pets(owner_id: int) -> list[Pet]:
     if owner_id not in db_owners:
         raise HTTPException(status_code=404, detail="Owner not found")
-    return [p for p in db_pets.values() if p.owner_id == owner_id]
+    return list(db_pets_by_owner.get(owner_id, {}).values())
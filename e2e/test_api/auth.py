@@ -1,3 +1,5 @@
+import hmac
+
 from fastapi import Depends, HTTPException
 from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 
@@ -8,12 +10,17 @@ bearer_scheme = HTTPBearer(auto_error=False)
 api_key_scheme = APIKeyHeader(name="X-Api-Key", auto_error=False)
 
 
+def _matches(provided: str, expected: str) -> bool:
+    # Compare as bytes: compare_digest rejects non-ASCII str arguments.
+    return hmac.compare_digest(provided.encode(), expected.encode())
+
+
 def require_auth(
     bearer: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     api_key: str | None = Depends(api_key_scheme),
 ) -> None:
-    if bearer is not None and bearer.credentials == BEARER_TOKEN:
+    if bearer is not None and _matches(bearer.credentials, BEARER_TOKEN):
         return
-    if api_key is not None and api_key == API_KEY:
+    if api_key is not None and _matches(api_key, API_KEY):
         return
     raise HTTPException(status_code=401, detail="Unauthorized")
@@ -0,0 +1,18 @@
+"""Regenerate the pre-built OpenAPI 3.0.3 schema served by the test API.
+
+Usage: python -m test_api.dump_openapi   (run from the e2e directory)
+"""
+
+import json
+
+from test_api.app import OPENAPI_CACHE, build_openapi
+
+
+def main() -> None:
+    schema = build_openapi()
+    OPENAPI_CACHE.write_text(json.dumps(schema, indent=2) + "\n")
+    print(f"wrote {OPENAPI_CACHE}")
+
+
+if __name__ == "__main__":
+    main()
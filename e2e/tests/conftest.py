@@ -189,6 +189,13 @@ async def mcp_http_session(toolscript_binary, openapi_spec_url, jwks_server, sig
         proc.wait(timeout=5)
 
 
+@pytest_asyncio.fixture(loop_scope="session", scope="session")
+async def http_client():
+    """Shared httpx client so raw HTTP tests reuse pooled connections."""
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        yield client
+
+
 @pytest.fixture(scope="session")
 def mcp_http_url(toolscript_binary, openapi_spec_url, jwks_server):
     """Spawn toolscript with HTTP transport + JWT auth, yield the base URL.
@@ -274,7 +281,7 @@ async def mcp_stdio_session(toolscript_binary: Path, openapi_spec_url: str):
             pass
 
 
-@pytest_asyncio.fixture(loop_scope="session")
+@pytest_asyncio.fixture(loop_scope="session", scope="session")
 async def mcp_no_auth_session(toolscript_binary: Path, openapi_spec_url: str):
     """toolscript instance with NO upstream API credentials."""
     env = {"PATH": "/usr/bin:/bin"}
@@ -1,6 +1,5 @@
-import json
-
 import httpx
+import orjson
 import pytest
 from mcp import ClientSession
 
@@ -8,7 +7,7 @@ from mcp import ClientSession
 def parse_result(result) -> dict:
     text = result.content[0].text
     assert not result.isError, f"Script execution error: {text}"
-    return json.loads(text)
+    return orjson.loads(text)
 
 
 @pytest.mark.asyncio
@@ -29,26 +28,24 @@ async def test_http_execute_script(mcp_http_session: ClientSession):
 
 
 @pytest.mark.asyncio
-async def test_http_auth_required(mcp_http_url: str):
+async def test_http_auth_required(mcp_http_url: str, http_client: httpx.AsyncClient):
     """Request to /mcp without JWT should be rejected."""
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{mcp_http_url}/mcp",
-            json={"jsonrpc": "2.0", "method": "initialize", "id": 1, "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {"name": "test", "version": "1.0"}
-            }},
-            headers={"Content-Type": "application/json"},
-        )
+    resp = await http_client.post(
+        f"{mcp_http_url}/mcp",
+        json={"jsonrpc": "2.0", "method": "initialize", "id": 1, "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "test", "version": "1.0"}
+        }},
+        headers={"Content-Type": "application/json"},
+    )
     assert resp.status_code == 401
 
 
 @pytest.mark.asyncio
-async def test_http_well_known(mcp_http_url: str):
+async def test_http_well_known(mcp_http_url: str, http_client: httpx.AsyncClient):
     """Well-known endpoint returns OAuth metadata (accessible without auth)."""
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{mcp_http_url}/.well-known/oauth-protected-resource")
+    resp = await http_client.get(f"{mcp_http_url}/.well-known/oauth-protected-resource")
     assert resp.status_code == 200
     data = resp.json()
     assert data["resource"] == "test-audience"
@@ -0,0 +1,47 @@
+"""Checks on the e2e test API itself (no toolscript involved)."""
+
+import json
+
+import httpx
+
+from test_api.app import OPENAPI_CACHE, build_openapi
+
+
+def test_openapi_cache_matches_routes():
+    """Regenerate with `python -m test_api.dump_openapi` if this fails."""
+    assert build_openapi() == json.loads(OPENAPI_CACHE.read_text())
+
+
+AUTH = {"Authorization": "Bearer test-secret-123"}
+
+
+def test_list_pets_status_keeps_id_order_after_update(test_api_url: str):
+    """A pet moved into a status bucket keeps its place, so limit picks the same pets."""
+    resp = httpx.put(f"{test_api_url}/pets/1", json={"status": "pending"}, headers=AUTH)
+    assert resp.status_code == 200
+    data = httpx.get(f"{test_api_url}/pets", params={"status": "pending"}).json()
+    assert [p["id"] for p in data["items"]] == [1, 4]
+    data = httpx.get(f"{test_api_url}/pets", params={"status": "pending", "limit": 1}).json()
+    assert data["total"] == 2
+    assert [p["name"] for p in data["items"]] == ["Fido"]
+
+
+def test_update_pet_null_status_is_stored(test_api_url: str):
+    """An explicit null status overwrites, like any other nullable field."""
+    resp = httpx.put(f"{test_api_url}/pets/1", json={"status": None, "tag": "hound"}, headers=AUTH)
+    assert resp.status_code == 200
+    assert resp.json()["status"] is None
+    assert resp.json()["tag"] == "hound"
+    data = httpx.get(f"{test_api_url}/pets", params={"status": "active"}).json()
+    assert [p["id"] for p in data["items"]] == [3]
+    resp = httpx.put(f"{test_api_url}/pets/1", json={"status": "active"}, headers=AUTH)
+    assert resp.status_code == 200
+    data = httpx.get(f"{test_api_url}/pets", params={"status": "active"}).json()
+    assert [p["id"] for p in data["items"]] == [1, 3]
+
+
+def test_list_owner_pets_keeps_id_order_after_update(test_api_url: str):
+    resp = httpx.put(f"{test_api_url}/pets/1", json={"owner_id": 2}, headers=AUTH)
+    assert resp.status_code == 200
+    pets = httpx.get(f"{test_api_url}/owners/2/pets").json()
+    assert [p["id"] for p in pets] == [1, 3]